@@ -1,9 +1,10 @@
 from qiskit import QuantumCircuit, ClassicalRegister, QuantumRegister, transpile
 from termcolor import colored
+from stabilizer import StabilizerState, sample_counts
 
 
 class Board:
-    def __init__(self, size=3, simulator=None):
+    def __init__(self, size=3, simulator=None, rng=None):
         # Initialize the quantum circuit with one qubit and classical bit for each cell
         self.size = size
         self.simulator = simulator
@@ -14,6 +15,9 @@ class Board:
         self.bits = ClassicalRegister(size**2, 'c')
         self.circuit = QuantumCircuit(self.qubits, self.bits)
         
+        # Without a simulator, the board state is tracked by a stabilizer tableau since all its gates are Clifford
+        self.state = StabilizerState(size**2, rng) if simulator is None else None
+        
         ''' For a 3x3 board, the winning lines are:
         - Horizontal lines: (0, 1, 2), (3, 4, 5), (6, 7, 8)
         - Vertical lines: (0, 3, 6), (1, 4, 7), (2, 5, 8)
@@ -40,6 +44,12 @@ class Board:
             if i < self.size - 1: # Add horizontal separator
                 board_str += '-' * (5 * self.size - 1) + '\n'
         return board_str
+    
+    
+    def apply_gate(self, gate, *indices, on_state=True):
+        # Record the gate on the circuit and mirror it on the stabilizer tableau (if used)
+        getattr(self.circuit, gate)(*[self.qubits[i] for i in indices])
+        if self.state is not None and on_state: getattr(self.state, gate)(*indices)
 
     
     def make_classical_move(self, row, col, player_mark, is_collapsed=False):
@@ -47,8 +57,7 @@ class Board:
             self.cells[row][col] = player_mark
             index = row * self.size + col
             
-            if player_mark == 'X': self.circuit.x(self.qubits[index])
-            else: self.circuit.id(self.qubits[index])
+            self.apply_gate('x' if player_mark == 'X' else 'id', index, on_state=not is_collapsed)
             return True
         return False
 
@@ -56,7 +65,7 @@ class Board:
     def make_swap_move(self, row1, col1, row2, col2, **kwargs):
         if self.cells[row1][col1] != ' ' and self.cells[row2][col2] != ' ':
             indices = [row1 * self.size + col1, row2 * self.size + col2]
-            self.circuit.swap(self.qubits[indices[0]], self.qubits[indices[1]])
+            self.apply_gate('swap', *indices)
             self.cells[row1][col1], self.cells[row2][col2] = self.cells[row2][col2], self.cells[row1][col1]
             return True
         return False
@@ -65,7 +74,7 @@ class Board:
     def make_superposition_move(self, row, col, player_mark, **kwargs):
         if self.cells[row][col] == ' ':
             index = row * self.size + col
-            self.circuit.h(self.qubits[index])
+            self.apply_gate('h', index)
             self.cells[row][col] = player_mark + '?'
             self.superposition_count += 1
             return True
@@ -80,23 +89,23 @@ class Board:
             any(self.cells[row][col] != ' ' for row, col in positions): return False
         
         indices = [row * self.size + col for row, col in positions]
-        self.circuit.h(self.qubits[indices[0]])
+        self.apply_gate('h', indices[0])
         
         if pos_count == 2: 
             # Pairwise Entanglement with Bell state for 2 qubits:
             # Lv1. |Ψ+⟩ = (∣01⟩ + ∣10⟩)/√2 | Lv3. |Φ+⟩ = (∣00⟩ + ∣11⟩)/√2
-            if risk_level == 1: self.circuit.x(self.qubits[indices[1]])
-            self.circuit.cx(self.qubits[indices[0]], self.qubits[indices[1]])
+            if risk_level == 1: self.apply_gate('x', indices[1])
+            self.apply_gate('cx', indices[0], indices[1])
         else: 
             # Triple Entanglement with GHZ state for 3 qubits:
             # Lv2. (∣010⟩ + ∣101⟩)/√2 | Lv4. (∣000⟩ + ∣111⟩)/√2
             if risk_level == 2: 
-                self.circuit.x(self.qubits[indices[1]])
-                self.circuit.x(self.qubits[indices[2]])
+                self.apply_gate('x', indices[1])
+                self.apply_gate('x', indices[2])
                 
             # Apply CNOT chain to entangle all 3 qubits
-            self.circuit.cx(self.qubits[indices[0]], self.qubits[indices[1]])
-            self.circuit.cx(self.qubits[indices[1]], self.qubits[indices[2]])
+            self.apply_gate('cx', indices[0], indices[1])
+            self.apply_gate('cx', indices[1], indices[2])
             
         for row, col in positions: self.cells[row][col] = player_mark + '?'
         self.superposition_count += pos_count
@@ -111,26 +120,43 @@ class Board:
         return False
     
 
-    def collapse_board(self):
+    def collapse_board(self, shots=1024):
         # Update the board based on the measurement results and apply the corresponding classical moves
         self.circuit.barrier()
         self.circuit.measure(self.qubits, self.bits) # Measure all qubits to collapse them to classical states
         
-        transpiled_circuit = transpile(self.circuit, self.simulator)
-        job = self.simulator.run(transpiled_circuit, memory=True)
-        counts = job.result().get_counts()
-        max_state = max(counts, key=counts.get)[::-1] # Get the state with the highest probability
+        if self.state is None:
+            transpiled_circuit = transpile(self.circuit, self.simulator)
+            job = self.simulator.run(transpiled_circuit, shots=shots, memory=True)
+            counts = job.result().get_counts()
+            max_state = max(counts, key=counts.get)[::-1] # Get the state with the highest probability
+        else: counts, max_state = self.collapse_state(shots)
         
         for i in range(self.size ** 2):
             row, col = divmod(i, self.size)
             if self.cells[row][col].endswith('?'):
-                self.circuit.reset(self.qubits[i]) 
+                # The tableau already holds the measured basis state => Reset + X leave it unchanged
+                self.apply_gate('reset', i, on_state=False)
                 self.make_classical_move(row, col, 'X' if max_state[i] == '1' else 'O', is_collapsed=True)
                 
         self.superposition_count = 0
         return counts
 
     
+    def collapse_state(self, shots=1024):
+        # All outcomes of a stabilizer state are equally likely => 1 measured sample is the collapsed state.
+        # Only superposed/entangled cells are measured since classical cells are already deterministic.
+        basis = self.state.support_basis() # Taken before collapsing to sample the histogram of the whole state
+        sample = 0
+        for i in range(self.size ** 2):
+            row, col = divmod(i, self.size)
+            if self.cells[row][col].endswith('?'): sample |= self.state.measure(i) << i
+            elif self.cells[row][col] == 'X': sample |= 1 << i
+        
+        counts = sample_counts(sample, basis, self.size ** 2, shots, self.state.rng)
+        return counts, format(sample, f'0{self.size ** 2}b')[::-1]
+
+    
     def check_win(self):
         # Dynamic implementation for above logic with dynamic winning lines
         for line in self.winning_lines:
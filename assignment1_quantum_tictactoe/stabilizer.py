@@ -0,0 +1,121 @@
+from collections import Counter
+import random
+
+
+def pauli_product(x1, z1, r1, x2, z2, r2):
+    ''' Multiply 2 Pauli strings stored as bitmasks (bit j = qubit j) and return the (x, z, r) of the product.
+    The phase exponent of i for each qubit follows the g function of Aaronson & Gottesman (CHP), counted with
+    popcounts so that the whole row is combined in a few big-integer operations instead of a loop over qubits.
+    '''
+    x_only, z_only, y_only = x1 & ~z1, z1 & ~x1, x1 & z1
+    plus = (x_only & x2 & z2) | (z_only & x2 & ~z2) | (y_only & z2 & ~x2)
+    minus = (x_only & z2 & ~x2) | (z_only & x2 & z2) | (y_only & x2 & ~z2)
+    phase = (2 * r1 + 2 * r2 + plus.bit_count() - minus.bit_count()) % 4
+    return x1 ^ x2, z1 ^ z2, phase // 2 # Phase is always 0 or 2 for commuting rows => sign bit
+
+
+class StabilizerState:
+    ''' Stabilizer tableau of n qubits initialized to |0...0⟩. Rows 0..n-1 are destabilizers and rows n..2n-1 are
+    stabilizers, each stored as X/Z bitmasks with a sign bit. Every gate used by the board (x, id, h, cx, swap,
+    reset, measure) is a Clifford operation, so each of them runs in polynomial time instead of 2^n amplitudes.
+    '''
+    def __init__(self, num_qubits, rng=None):
+        self.num_qubits = num_qubits
+        self.rng = rng or random # Any object with `getrandbits`, e.g. a seeded `random.Random`
+        self.xs = [1 << i for i in range(num_qubits)] + [0] * num_qubits # Destabilizers X_i
+        self.zs = [0] * num_qubits + [1 << i for i in range(num_qubits)] # Stabilizers Z_i
+        self.rs = [0] * (2 * num_qubits)
+
+
+    def id(self, a): pass
+
+
+    def x(self, a):
+        # X anticommutes with the Z/Y component on qubit a => flip the sign of those rows
+        for i, z in enumerate(self.zs):
+            if z >> a & 1: self.rs[i] ^= 1
+
+
+    def h(self, a):
+        mask = 1 << a
+        for i in range(2 * self.num_qubits):
+            xa, za = self.xs[i] & mask, self.zs[i] & mask
+            if xa and za: self.rs[i] ^= 1 # H Y H = -Y
+            if bool(xa) != bool(za): # Swap X and Z components on qubit a
+                self.xs[i] ^= mask
+                self.zs[i] ^= mask
+
+
+    def cx(self, a, b):
+        for i in range(2 * self.num_qubits):
+            xa, zb = self.xs[i] >> a & 1, self.zs[i] >> b & 1
+            if xa and zb and (self.xs[i] >> b & 1) == (self.zs[i] >> a & 1): self.rs[i] ^= 1
+            if xa: self.xs[i] ^= 1 << b
+            if zb: self.zs[i] ^= 1 << a
+
+
+    def swap(self, a, b):
+        mask = (1 << a) | (1 << b)
+        for i in range(2 * self.num_qubits):
+            if (self.xs[i] >> a ^ self.xs[i] >> b) & 1: self.xs[i] ^= mask
+            if (self.zs[i] >> a ^ self.zs[i] >> b) & 1: self.zs[i] ^= mask
+
+
+    def _rowsum(self, h, i):
+        self.xs[h], self.zs[h], self.rs[h] = pauli_product(
+            self.xs[i], self.zs[i], self.rs[i], self.xs[h], self.zs[h], self.rs[h])
+
+
+    def measure(self, a):
+        # Measure qubit a in the computational basis with O(n) row products, i.e. O(n²) bit operations
+        n, mask = self.num_qubits, 1 << a
+        rows = [i for i, x in enumerate(self.xs) if x & mask] # Rows anticommuting with Z_a
+        p = next((i for i in rows if i >= n), None)
+
+        if p is not None: # Some stabilizer anticommutes with Z_a => random outcome
+            for i in rows:
+                if i != p: self._rowsum(i, p)
+            self.xs[p - n], self.zs[p - n], self.rs[p - n] = self.xs[p], self.zs[p], self.rs[p]
+            outcome = self.rng.getrandbits(1)
+            self.xs[p], self.zs[p], self.rs[p] = 0, 1 << a, outcome
+            return outcome
+
+        # Deterministic outcome => Z_a is a product of stabilizers picked by the destabilizers' X components
+        x, z, r = 0, 0, 0
+        for i in rows: x, z, r = pauli_product(self.xs[i + n], self.zs[i + n], self.rs[i + n], x, z, r)
+        return r
+
+
+    def reset(self, a):
+        if self.measure(a): self.x(a)
+
+
+    def support_basis(self):
+        # XOR basis of the stabilizers' X components: Measurement outcomes are uniform over x0 ⊕ span(basis)
+        basis = []
+        for v in self.xs[self.num_qubits:]:
+            if not v: continue
+            for b in basis: v = min(v, v ^ b)
+            if v: basis.append(v)
+        return basis
+
+
+def sample_counts(x0, basis, num_qubits, shots=1024, rng=random):
+    ''' Histogram of `shots` measurements of a stabilizer state from 1 measured outcome x0 and its `support_basis`,
+    without another pass over the tableau. x0 is always the first shot so the collapsed state appears in the counts.
+    Keys follow the Qiskit convention: qubit 0 is the rightmost character.
+    '''
+    # XOR of every 8-bit chunk of basis vectors is precomputed => Each distinct sample costs k/8 lookups, not k XORs
+    tables = []
+    for start in range(0, len(basis), 8):
+        table = [0]
+        for b in basis[start:start + 8]: table += [v ^ b for v in table]
+        tables.append(table)
+
+    choices = Counter([0] + [rng.getrandbits(len(basis)) if basis else 0 for _ in range(shots - 1)])
+    counts = {}
+    for choice, count in choices.items():
+        sample = x0
+        for j, table in enumerate(tables): sample ^= table[choice >> 8 * j & 255]
+        counts[format(sample, f'0{num_qubits}b')] = count
+    return counts
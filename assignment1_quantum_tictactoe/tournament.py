@@ -0,0 +1,293 @@
+from multiprocessing import Pool
+from collections import defaultdict
+from itertools import permutations
+from board import Board
+import argparse
+import random
+import json
+import time
+import math
+
+
+''' A move is a tuple (mode, positions, risk_level) using the same modes as the GUI:
+- ('CLASSICAL', [(row, col)], 0) | ('SUPERPOSITION', [(row, col)], 0)
+- ('SWAP', [(row1, col1), (row2, col2)], 0)
+- ('ENTANGLED', [(row1, col1), (row2, col2), ...], risk_level) with 2 positions for Lv1/3 and 3 for Lv2/4
+A policy is any picklable callable `policy(board, player_mark, rng) -> move`.
+'''
+def empty_cells(board):
+    return [(row, col) for row in range(board.size) for col in range(board.size) if board.cells[row][col] == ' ']
+
+
+def lines_through_cells(board):
+    lines = defaultdict(list)
+    for line in board.winning_lines:
+        for i in line: lines[i].append(line)
+    return lines
+
+
+class RandomPolicy:
+    name = 'random'
+
+    def __call__(self, board, player_mark, rng):
+        empty = empty_cells(board)
+        occupied = [(row, col) for row in range(board.size) for col in range(board.size) if board.cells[row][col] != ' ']
+        modes = ['CLASSICAL', 'SUPERPOSITION'] + ['SWAP'] * (len(occupied) >= 2) + ['ENTANGLED'] * (len(empty) >= 2)
+        mode = rng.choice(modes)
+
+        if mode == 'SWAP': return mode, rng.sample(occupied, 2), 0
+        if mode == 'ENTANGLED':
+            risk_level = rng.choice([1, 3] if len(empty) < 3 else [1, 2, 3, 4])
+            return mode, rng.sample(empty, 3 if risk_level in [2, 4] else 2), risk_level
+        return mode, [rng.choice(empty)], 0
+
+
+class GreedyPolicy:
+    # Classical moves only: win now > block the opponent > cell with the most promising open lines
+    name = 'greedy'
+    WIN_SCORE, BLOCK_SCORE = 1e6, 1e4
+
+    def __call__(self, board, player_mark, rng):
+        return 'CLASSICAL', [self.scored_cells(board, player_mark, rng)[0][1]], 0
+
+    def scored_cells(self, board, player_mark, rng):
+        opponent = 'O' if player_mark == 'X' else 'X'
+        marks = [cell for row in board.cells for cell in row]
+        lines = lines_through_cells(board)
+        scores = []
+
+        for row, col in empty_cells(board):
+            index = row * board.size + col
+            score = rng.random() # Random tie-breaker
+            for line in lines[index]:
+                own = sum(marks[i] == player_mark for i in line)
+                other = sum(marks[i] == opponent for i in line)
+                if own == len(line) - 1: score += self.WIN_SCORE # Winning move
+                elif other == len(line) - 1: score += self.BLOCK_SCORE # Blocking move
+                elif other == 0 and not any(marks[i].endswith('?') for i in line): score += (1 + own) ** 2
+            scores.append((score, (row, col)))
+        return sorted(scores, reverse=True)
+
+
+class MonteCarloPolicy(GreedyPolicy):
+    # Flat Monte Carlo search over the greedy top candidates with tactical playouts (win > block > random).
+    # Superposed/entangled cells are resolved by a fair coin in each playout, matching their 50/50 marginals.
+    name = 'search'
+
+    def __init__(self, candidates=5, playouts=16):
+        self.candidates = candidates
+        self.playouts = playouts
+
+    def __call__(self, board, player_mark, rng):
+        scored = self.scored_cells(board, player_mark, rng)
+        if scored[0][0] >= self.BLOCK_SCORE: return 'CLASSICAL', [scored[0][1]], 0 # Forced win or block => No search
+
+        candidates = [cell for _, cell in scored[:self.candidates]]
+        lines = lines_through_cells(board)
+        scores = [
+            sum(self.playout(board, lines, cell, player_mark, rng) for _ in range(self.playouts))
+            for cell in candidates
+        ]
+        return 'CLASSICAL', [candidates[scores.index(max(scores))]], 0
+
+    def playout(self, board, lines, cell, player_mark, rng):
+        marks = [rng.choice('XO') if mark.endswith('?') else mark for row in board.cells for mark in row]
+        empty = [i for i, mark in enumerate(marks) if mark == ' ']
+        rng.shuffle(empty)
+        threats = {'X': set(), 'O': set()} # Empty cells completing a line for each player
+        for line in board.winning_lines: self.add_threat(marks, line, threats)
+        index, current = cell[0] * board.size + cell[1], player_mark
+
+        while True:
+            empty.remove(index)
+            marks[index] = current
+            if any(all(marks[i] == current for i in line) for line in lines[index]):
+                return 1 if current == player_mark else 0
+            if not empty: return 0.5 # Draw
+
+            for line in lines[index]: self.add_threat(marks, line, threats)
+            current = 'O' if current == 'X' else 'X'
+            wins = [i for i in threats[current] if marks[i] == ' ']
+            blocks = [i for i in threats['O' if current == 'X' else 'X'] if marks[i] == ' ']
+            index = wins[0] if wins else blocks[0] if blocks else empty[-1]
+
+    @staticmethod
+    def add_threat(marks, line, threats):
+        # A line with 1 empty cell and all other cells of the same player => That cell completes it
+        empty = [i for i in line if marks[i] == ' ']
+        filled = {marks[i] for i in line if marks[i] != ' '}
+        if len(empty) == 1 and len(filled) == 1: threats[filled.pop()].add(empty[0])
+
+
+POLICIES = {policy.name: policy for policy in [RandomPolicy, GreedyPolicy, MonteCarloPolicy]}
+
+
+def apply_move(board, move, player_mark):
+    mode, positions, risk_level = move
+    if mode == 'CLASSICAL': return board.make_classical_move(*positions[0], player_mark)
+    if mode == 'SUPERPOSITION': return board.make_superposition_move(*positions[0], player_mark=player_mark)
+    if mode == 'SWAP': return board.make_swap_move(*positions[0], *positions[1])
+    if mode == 'ENTANGLED': return board.make_entangled_move(*positions, risk_level=risk_level, player_mark=player_mark)
+    return False
+
+
+def play_game(game):
+    # Play 1 headless game following the same collapse rules as the CLI/GUI and return its JSON-serializable record
+    # Independent streams for the policies' moves and the board's collapses, without touching the global `random`
+    rng = random.Random(f"{game['seed']}:moves")
+    game = dict(game)
+    policies = {
+        mark: POLICIES[policy]() if isinstance(policy, str) else policy
+        for mark, policy in game.pop('policies').items()
+    }
+    board, player_mark = Board(game['size'], rng=random.Random(f"{game['seed']}:collapse")), 'X'
+    record = dict(game, winner=None, winning_line=None, moves=0, collapses=0, truncated=False, latencies={'X': [], 'O': []})
+
+    while record['moves'] < game['max_moves']:
+        start = time.perf_counter()
+        move = policies[player_mark](board, player_mark, rng)
+        if not apply_move(board, move, player_mark):
+            raise ValueError(f'Invalid move {move} from {record[player_mark]} policy as {player_mark}')
+
+        if move[0] != 'CLASSICAL' and board.can_be_collapsed():
+            board.collapse_board()
+            record['collapses'] += 1
+
+        while True:
+            result = board.check_win()
+            if type(result) != int: break
+            board.collapse_board() # All cells are filled but some are still in superpositions
+            record['collapses'] += 1
+
+        record['latencies'][player_mark].append(time.perf_counter() - start)
+        record['moves'] += 1
+        if result == 'Draw': return record
+        if type(result) == tuple:
+            record['winner'] = board.cells[result[0] // board.size][result[0] % board.size]
+            record['winning_line'] = list(result)
+            return record
+        player_mark = 'O' if player_mark == 'X' else 'X'
+
+    record['truncated'] = True # Too many moves without a result (e.g. endless SWAP moves) => Draw
+    return record
+
+
+def percentiles(values, ps=(50, 90, 99)):
+    values = sorted(values)
+    if not values: return {f'p{p}': None for p in ps}
+    return {f'p{p}': values[min(len(values) - 1, math.ceil(p / 100 * len(values)) - 1)] for p in ps} # Nearest-rank
+
+
+def summarize(records):
+    matchups = defaultdict(lambda: {'games': 0, 'X': 0, 'O': 0, 'draws': 0, 'truncated': 0, 'collapses': 0})
+    players = defaultdict(lambda: {'games': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'latencies': []})
+
+    for record in records:
+        matchup = matchups[(record['size'], record['X'], record['O'])]
+        matchup['games'] += 1
+        matchup['truncated'] += record['truncated']
+        matchup['collapses'] += record['collapses']
+        if record['winner']: matchup[record['winner']] += 1
+        else: matchup['draws'] += 1
+
+        for mark in ['X', 'O']:
+            player = players[record[mark]]
+            player['games'] += 1
+            player['latencies'] += record['latencies'][mark]
+            if not record['winner']: player['draws'] += 1
+            elif record['winner'] == mark: player['wins'] += 1
+            else: player['losses'] += 1
+
+    return {
+        'games': len(records),
+        'collapses': sum(record['collapses'] for record in records),
+        'matchups': [{
+            'size': size, 'X': x_name, 'O': o_name, 'games': m['games'],
+            'x_win_rate': m['X'] / m['games'], 'o_win_rate': m['O'] / m['games'], 'draw_rate': m['draws'] / m['games'],
+            'truncated': m['truncated'], 'collapses': m['collapses'], 'avg_collapses': m['collapses'] / m['games'],
+        } for (size, x_name, o_name), m in sorted(matchups.items())],
+        'policies': {name: {
+            'games': p['games'], 'win_rate': p['wins'] / p['games'],
+            'draw_rate': p['draws'] / p['games'], 'loss_rate': p['losses'] / p['games'],
+            'latency_ms': {k: v and v * 1e3 for k, v in percentiles(p['latencies']).items()},
+        } for name, p in sorted(players.items())},
+    }
+
+
+def policy_name(policy):
+    # Stable label for the stats, resolved in the parent process (unpickled copies of an instance differ in `str`)
+    if isinstance(policy, str): return policy
+    return getattr(policy, 'name', type(policy).__name__)
+
+
+class QuantumT3Tournament:
+    def __init__(self, policies, sizes=(3,), games_per_matchup=10, seed=0, max_moves=None, processes=None):
+        self.policies = policies # Policy names in `POLICIES` or picklable policy instances
+        self.sizes = sizes
+        self.games_per_matchup = games_per_matchup
+        self.seed = seed
+        self.max_moves = max_moves # Defaults to 4 moves per cell
+        self.processes = processes # `None` for all CPUs, `1` to play in the current process
+
+
+    def schedule(self):
+        # Every ordered pair of policies (each one plays both X and O) on every board size, 1 seed per game
+        games = []
+        for size in self.sizes:
+            for x_policy, o_policy in permutations(self.policies, 2):
+                for _ in range(self.games_per_matchup):
+                    games.append({
+                        'game_id': len(games), 'seed': self.seed + len(games), 'size': size,
+                        'X': policy_name(x_policy), 'O': policy_name(o_policy), 'policies': {'X': x_policy, 'O': o_policy},
+                        'max_moves': self.max_moves or 4 * size**2
+                    })
+        return games
+
+
+    def run(self, output_path=None):
+        # Results are appended to `output_path` (JSON Lines) as soon as each game finishes
+        games, records = self.schedule(), []
+        output = open(output_path, 'w') if output_path else None
+
+        def collect(results):
+            for record in results:
+                records.append(record)
+                if output:
+                    output.write(json.dumps(record) + '\n')
+                    output.flush()
+        try:
+            if self.processes == 1: collect(map(play_game, games))
+            else:
+                with Pool(self.processes) as pool: # Exiting terminates the queued games if a policy raises
+                    collect(pool.imap_unordered(play_game, games))
+                    pool.close()
+                    pool.join()
+        finally:
+            if output: output.close()
+        return summarize(sorted(records, key=lambda record: record['game_id']))
+
+
+def print_summary(summary):
+    print(f"[INFO] {summary['games']} games played with {summary['collapses']} collapses")
+    for m in summary['matchups']:
+        print(f"- {m['size']}x{m['size']} {m['X']} (X) vs {m['O']} (O): X wins {m['x_win_rate']:.1%}, "
+              f"O wins {m['o_win_rate']:.1%}, Draws {m['draw_rate']:.1%} ({m['truncated']} truncated), "
+              f"{m['avg_collapses']:.2f} collapses/game")
+    for name, p in summary['policies'].items():
+        latency = ', '.join(f'{k} = {v:.3f} ms' for k, v in p['latency_ms'].items() if v is not None)
+        print(f"- {name}: Win {p['win_rate']:.1%} / Draw {p['draw_rate']:.1%} / Loss {p['loss_rate']:.1%} | Move latency: {latency}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Headless Quantum Tic-Tac-Toe tournament between scripted policies')
+    parser.add_argument('--policies', nargs='+', default=list(POLICIES), choices=list(POLICIES))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[3])
+    parser.add_argument('--games', type=int, default=10, help='Games per ordered pair of policies and board size')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-moves', type=int, default=None)
+    parser.add_argument('--processes', type=int, default=None)
+    parser.add_argument('--output', default='tournament_results.jsonl')
+    args = parser.parse_args()
+
+    tournament = QuantumT3Tournament(args.policies, args.sizes, args.games, args.seed, args.max_moves, args.processes)
+    print_summary(tournament.run(args.output))
@@ -0,0 +1,95 @@
+from number_theory import mod_pow, perfect_power, is_order_multiple, refine_order
+import random
+import sympy
+import math
+import time
+
+
+''' Compare the classical steps of ShorAlgorithm before/after `number_theory` for 20-64 bit N = p * q:
+- Order check: `a ** r % N` vs `mod_pow(a, r, N)`, skipped for the old code once a^r would exceed ~16 MB
+- Postprocessing: gcd(a^{r/2} ± 1, N) with the full a^{r/2} vs a^{r/2} mod N
+- Perfect power test: float `round(N ** (1 / k))` vs exact `integer_root`, timed on N = p * q and checked for
+  correctness on N = p^k, where float roots start failing once the prime p has ~48+ bits
+- Order refinement: recovering the order from a candidate that only divides it (continued fractions with gcd(s, r) > 1)
+'''
+MAX_LEGACY_BITS = 2**27
+
+
+def timed(func, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat): result = func()
+    return result, (time.perf_counter() - start) / repeat
+
+
+def legacy_perfect_power(N):
+    for k in range(int(math.log2(N)), 1, -1):
+        p = round(N ** (1 / k))
+        if p ** k == N: return p, k
+    return None
+
+
+def random_prime(bits, rng):
+    # Drawn from `rng` (unlike `sympy.randprime`) so the benchmark seed fixes every N
+    while True:
+        p = sympy.nextprime(rng.randrange(2 ** (bits - 1), 2 ** bits))
+        if p < 2 ** bits: return p
+
+
+def random_case(bits, rng):
+    N = random_prime(bits // 2, rng) * random_prime(bits - bits // 2, rng)
+    while True:
+        a = rng.randrange(2, N)
+        if math.gcd(a, N) == 1: return N, a, sympy.n_order(a, N)
+
+
+def format_time(seconds): return 'skipped' if seconds is None else f'{seconds * 1e6:.1f} µs'
+
+
+def benchmark(bit_sizes=(20, 24, 32, 40, 48, 56, 64), seed=0):
+    rng = random.Random(seed)
+    print(f"{'bits':>4} | {'a^r % N':>12} | {'mod_pow':>12} | {'gcd (old)':>12} | {'gcd (new)':>12} | "
+          f"{'root (old)':>12} | {'root (new)':>12} | {'refine':>12}")
+
+    for bits in bit_sizes:
+        N, a, r = random_case(bits, rng)
+        legacy_feasible = r * N.bit_length() <= MAX_LEGACY_BITS
+        half = r // 2 if r % 2 == 0 else r
+
+        old_order = timed(lambda: a ** r % N == 1, 1)[1] if legacy_feasible else None
+        new_order = timed(lambda: is_order_multiple(a, r, N))[1]
+        old_gcd = timed(lambda: (math.gcd(a ** half - 1, N), math.gcd(a ** half + 1, N)), 1)[1] if legacy_feasible else None
+        new_gcd = timed(lambda: (math.gcd(mod_pow(a, half, N) - 1, N), math.gcd(mod_pow(a, half, N) + 1, N)))[1]
+
+        old_root = timed(lambda: legacy_perfect_power(N))[1]
+        new_root = timed(lambda: perfect_power.__wrapped__(N))[1] # Bypass the per-N cache to time the computation
+
+        divisor = r // min(sympy.factorint(r)) if r > 1 else r # Candidate missing the smallest prime factor
+        refined, refine_time = timed(lambda: refine_order.__wrapped__(a, divisor, N))
+        assert refined == r
+
+        print(f'{bits:>4} | {format_time(old_order):>12} | {format_time(new_order):>12} | {format_time(old_gcd):>12} | '
+              f'{format_time(new_gcd):>12} | {format_time(old_root):>12} | {format_time(new_root):>12} | '
+              f'{format_time(refine_time):>12}')
+
+
+def benchmark_prime_powers(prime_bits=(20, 32, 48, 52, 56, 64), exponents=(2, 3, 5), trials=20, seed=0):
+    # Fraction of N = p^k recognized as (p, k) by the float test vs the exact test
+    rng = random.Random(seed)
+    print(f"\n{'p bits':>6} | {'k':>2} | {'N bits':>6} | {'old correct':>11} | {'new correct':>11} | "
+          f"{'root (old)':>12} | {'root (new)':>12}")
+
+    for bits in prime_bits:
+        for k in exponents:
+            powers = [(p, p ** k) for p in (random_prime(bits, rng) for _ in range(trials))]
+            old_correct = sum(legacy_perfect_power(N) == (p, k) for p, N in powers)
+            new_correct = sum(perfect_power.__wrapped__(N) == (p, k) for p, N in powers)
+            old_root = timed(lambda: [legacy_perfect_power(N) for _, N in powers], 1)[1] / trials
+            new_root = timed(lambda: [perfect_power.__wrapped__(N) for _, N in powers], 1)[1] / trials
+            print(f'{bits:>6} | {k:>2} | {max(N.bit_length() for _, N in powers):>6} | '
+                  f'{f"{old_correct}/{trials}":>11} | {f"{new_correct}/{trials}":>11} | '
+                  f'{format_time(old_root):>12} | {format_time(new_root):>12}')
+
+
+if __name__ == '__main__':
+    benchmark()
+    benchmark_prime_powers()
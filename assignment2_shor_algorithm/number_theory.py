@@ -0,0 +1,54 @@
+from functools import lru_cache
+import sympy
+
+
+def mod_pow(a, exponent, N):
+    # Square-and-multiply in Python's built-in 3-argument pow => Never materializes the full a^exponent
+    return pow(a, exponent, N)
+
+
+def integer_root(n, k):
+    # Exact floor of the k-th root of n with integer Newton iterations (no float rounding for large n)
+    if n < 2: return n
+    # Newton must start above the root to decrease monotonically: a float guess with margin, or 2^ceil(bits / k)
+    if n.bit_length() < 1000: x = int(n ** (1 / k) * (1 + 1e-12)) + 1
+    else: x = 1 << -(-n.bit_length() // k)
+    while True:
+        y = ((k - 1) * x + n // x ** (k - 1)) // k
+        if y >= x: return x
+        x = y
+
+
+@lru_cache(maxsize=None)
+def perfect_power(N):
+    # Return (p, k) with N = p^k for the largest exponent k >= 2, or None if N is not a perfect power
+    for k in range(N.bit_length() - 1, 1, -1): # Start with a large exponent and reduce
+        p = integer_root(N, k)
+        if p ** k == N: return p, k
+    return None
+
+
+def is_order_multiple(a, r, N):
+    return r > 0 and mod_pow(a, r, N) == 1
+
+
+def minimal_order(a, r, N):
+    # Strip prime factors from a multiple r of the order while a^(r/p) = 1 (mod N) still holds
+    for p in sympy.factorint(r):
+        while r % p == 0 and mod_pow(a, r // p, N) == 1: r //= p
+    return r
+
+
+@lru_cache(maxsize=None)
+def refine_order(a, r, N, max_multiple=None):
+    ''' Continued fractions return r / gcd(s, r) when the measured phase s/r is not in lowest terms, so the candidate
+    may only be a divisor of the true order. Try its small multiples (up to the bit length of N by default) and
+    return the smallest r with a^r = 1 (mod N), or None if no multiple works and QPE must be repeated.
+    '''
+    step = mod_pow(a, r, N)
+    value = step
+    for multiple in range(1, (max_multiple or N.bit_length()) + 1):
+        if value == 1: return minimal_order(a, r * multiple, N)
+        value = value * step % N
+    return None
+
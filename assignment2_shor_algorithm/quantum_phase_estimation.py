@@ -1,5 +1,6 @@
 from qiskit import QuantumCircuit, transpile, assemble
 from qiskit.circuit.library import QFT
+from number_theory import mod_pow
 
 
 class CtrlMultCircuit(QuantumCircuit):
@@ -13,7 +14,7 @@ class CtrlMultCircuit(QuantumCircuit):
 
     def _create_circuit(self):
         for dec_power in range(self.power):
-            a_exp = self.a ** dec_power % self.N
+            a_exp = mod_pow(self.a, dec_power, self.N)
             for i in range(self.num_qubits):
                 if a_exp >> i & 1: self.x(i)
                 for j in range(i + 1, self.num_qubits):
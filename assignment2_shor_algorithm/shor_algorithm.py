@@ -1,4 +1,5 @@
 from quantum_phase_estimation import QPECircuit
+from number_theory import mod_pow, perfect_power, is_order_multiple, refine_order
 from fractions import Fraction
 import random
 import sympy
@@ -63,17 +64,16 @@ class ShorAlgorithm:
             print(f'=> {self.N} is a prime number: {self.N} = 1 * {self.N}')
             return 1, self.N
         
-        max_exponent = int(math.log2(self.N)) # Start with a large exponent and reduce
-        for k in range(max_exponent, 1, -1):
-            p = round(self.N ** (1 / k))
-            if p ** k == self.N: 
-                print(f'=> {self.N} is a power of prime: {self.N} = {p}^{k}')
-                return p, k
+        power = perfect_power(self.N) # Exact integer roots instead of float N^(1/k)
+        if power:
+            p, k = power
+            print(f'=> {self.N} is a power of prime: {self.N} = {p}^{k}')
+            return p, k
         return False
     
     
     def _quantum_period_finding(self):
-        while self.chosen_a ** self.r % self.N != 1: # QPE + continued fractions may find wrong r
+        while not is_order_multiple(self.chosen_a, self.r, self.N): # QPE + continued fractions may find wrong r
             self.qpe_circuit = QPECircuit(self.chosen_a, self.N) # Find phase s/r
             result = self.qpe_circuit.collapse(self.simulator)
             state_bin = result.get_memory()[0]
@@ -86,6 +86,7 @@ class ShorAlgorithm:
             if self.r > self.N or self.r == 1: # Safety check to avoid infinite loops
                 print(f'[ERR] Invalid period found: r = {self.r} => Retry with different a.')
                 return False
+            self.r = refine_order(self.chosen_a, self.r, self.N) or self.r # Rescue r that only divides the order
 
         print(f'>>> Output State: |{state_bin}⟩ = {state_dec} (dec) => Phase = {state_dec} / {bits_count} = {phase:.3f}')
         return True
@@ -99,7 +100,8 @@ class ShorAlgorithm:
             print(f'[ERR] r = {self.r} is odd => Retry with different a.')
             return None
 
-        int1, int2 = self.chosen_a ** (self.r // 2) - 1, self.chosen_a ** (self.r // 2) + 1
+        half_power = mod_pow(self.chosen_a, self.r // 2, self.N) # a^{r/2} mod N => Same gcds without the full a^{r/2}
+        int1, int2 = half_power - 1, half_power + 1
         if int1 % self.N == 0 or int2 % self.N == 0:
             print(f'[ERR] {self.chosen_a}^{self.r/2:.0f} ± 1 is a multiple of {self.N} => Retry with different a.')
             return None